@@ -5,21 +5,147 @@ Fixed Backend API for Render Deployment
 """
 
 import os
+import re
+import sys
+import atexit
+import copy
+import hashlib
+import importlib
+import itertools
 import json
+import queue
 import tempfile
+import threading
 import uuid
 import time
 import logging
-from datetime import datetime
+import logging.handlers
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, g, has_request_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# -------------------------
+# LOGGING
+# -------------------------
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_PAYLOAD_LIMIT = int(os.getenv("LOG_PAYLOAD_LIMIT", 200))  # Max chars of model output / payloads per log line
+LOG_MESSAGE_LIMIT = int(os.getenv("LOG_MESSAGE_LIMIT", 2000))  # Hard cap on any log message
+# Fraction of INFO/DEBUG records kept per high-frequency event, e.g. "health_check=0.05,poll_tick=0.2"
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split('=', 1)
+        for item in os.getenv("LOG_SAMPLE_RATES", "health_check=0.05,poll_tick=0.2").split(',')
+        if '=' in item
+    )
+}
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'request_id'}
+
+def truncate_for_log(value: Any, limit: int = LOG_PAYLOAD_LIMIT) -> str:
+    """Cap a payload before it is logged"""
+    text = str(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request's correlation id to every record"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = getattr(g, 'request_id', '-')
+        else:
+            record.request_id = '-'
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO/DEBUG records tagged with a high-frequency `event`"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.counters = {event: itertools.count() for event in rates}
+
+    def filter(self, record):
+        event = getattr(record, 'event', None)
+        if record.levelno >= logging.WARNING or event not in self.rates:
+            return True
+
+        rate = self.rates[event]
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        # Deterministic 1-in-N sampling keeps the first occurrence and spaces the rest evenly
+        record.sample_rate = rate
+        return next(self.counters[event]) % round(1 / rate) == 0
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, 'request_id', '-'),
+            "msg": truncate_for_log(record.getMessage(), LOG_MESSAGE_LIMIT)
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps a traceback as its own `exc` field instead of folding it into the message"""
+
+    def prepare(self, record):
+        if record.exc_info:
+            record = copy.copy(record)
+            record.exc = truncate_for_log(logging.Formatter().formatException(record.exc_info), LOG_MESSAGE_LIMIT)
+            record.exc_info = None
+            record.exc_text = None
+        return super().prepare(record)
+
+# Request threads only enqueue records; a background listener thread formats and writes them
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(JsonFormatter())
+log_queue_handler = StructuredQueueHandler(queue.Queue(-1))
+log_queue_handler.addFilter(RequestContextFilter())
+log_queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+log_listener: Optional[logging.handlers.QueueListener] = None
+
+def start_log_writer():
+    """Start (or restart after a fork) the background log writer thread"""
+    global log_listener
+    # A forked worker inherits neither the writer thread nor a safe queue, so both are replaced
+    log_queue_handler.queue = queue.Queue(-1)
+    log_listener = logging.handlers.QueueListener(log_queue_handler.queue, log_stream_handler, respect_handler_level=True)
+    log_listener.start()
+
+def stop_log_writer():
+    """Flush queued records and stop the writer thread"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+root_logger = logging.getLogger()
+root_logger.handlers = [log_queue_handler]
+root_logger.setLevel(LOG_LEVEL)
+logging.getLogger('werkzeug').setLevel(logging.WARNING)  # Access records are emitted by after_request
+start_log_writer()
+atexit.register(stop_log_writer)
+
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
@@ -30,8 +156,8 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
-        "expose_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type", "Authorization", "X-Request-ID"],
+        "expose_headers": ["Content-Type", "X-Request-ID"]
     }
 })
 
@@ -39,6 +165,28 @@ CORS(app, resources={
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB limit to prevent API overload
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'mp4', 'mov', 'avi', 'webm'}
 UPLOAD_FOLDER = '/tmp/uploads'
+SEGMENT_PAGE_SIZE = int(os.getenv("SEGMENT_PAGE_SIZE", 5))  # Segments returned per page
+INLINE_SEGMENT_LIMIT = int(os.getenv("INLINE_SEGMENT_LIMIT", 20))  # /analyze returns every segment up to this count
+TURN_PAGE_SIZE = int(os.getenv("TURN_PAGE_SIZE", 50))  # Turns returned per page
+SEGMENT_TURN_LIMIT = int(os.getenv("SEGMENT_TURN_LIMIT", 20))  # Turns sent with each segment; the rest come from /turns
+MAX_STORED_ANALYSES = int(os.getenv("MAX_STORED_ANALYSES", 50))  # Oldest results are evicted first
+GEMINI_MODEL_NAMES = ["models/gemini-2.5-flash", "models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
+# Module implementing the google.generativeai API; point it at a local fake to verify without network access
+GENAI_PROVIDER_MODULE = os.getenv("GENAI_PROVIDER_MODULE", "google.generativeai")
+
+# Prompt selection and provider-side context caching of the fixed analysis instructions
+ANALYSIS_PROMPT_VERSION = os.getenv("ANALYSIS_PROMPT_VERSION", "v1")
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", 3600))  # Seconds a cached context lives
+PROMPT_CACHE_REFRESH_MARGIN = int(os.getenv("PROMPT_CACHE_REFRESH_MARGIN", 300))  # Extend the TTL this long before expiry
+
+# Startup warm-up: "sync" runs inline, "background" uses a thread, "off" disables it
+WARMUP_MODE = os.getenv("WARMUP_MODE", "background").lower()
+WARMUP_MODULES = [name.strip() for name in os.getenv("WARMUP_MODULES", "grpc,google.protobuf,google.generativeai").split(',') if name.strip()]
+# Set by gunicorn.conf.py: the app is imported in the master and workers are forked afterwards
+WARMUP_PER_WORKER = os.getenv("WARMUP_PER_WORKER", "false").lower() == "true"
+# SDK client factories called during warm-up; the SDK otherwise builds these on first use
+GEMINI_CLIENT_FACTORIES = ["get_default_generative_client", "get_default_file_client", "get_default_cache_client"]
 
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -191,6 +339,624 @@ def create_sample_analysis(filename: str = "meeting.mp4") -> Dict[str, Any]:
         ]
     }
 
+# -------------------------
+# TRANSCRIPT NORMALIZATION
+# -------------------------
+
+# Matches "[01:15] Speaker B:" as well as a bare "Speaker A:" label
+SPEAKER_TURN_PATTERN = re.compile(r'(?:\[(\d{1,2}:\d{2}(?::\d{2})?)\]\s*)?\b(Speaker [A-Z])\s*:\s*')
+SPEAKER_NAME_PATTERN = re.compile(r'Speaker [A-Z]')
+
+# In-memory store of normalized analyses for paginated retrieval
+analysis_store: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+analysis_store_lock = threading.Lock()
+
+def parse_timestamp(value: str) -> Optional[int]:
+    """Convert an "mm:ss" or "hh:mm:ss" timestamp to seconds"""
+    try:
+        parts = [int(part) for part in value.strip().split(':')]
+    except (AttributeError, ValueError):
+        return None
+
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+def parse_time_range(time_range: str) -> Tuple[Optional[int], Optional[int]]:
+    """Split a segment time range such as "00:00–01:30" into start/end seconds"""
+    bounds = re.split(r'\s*[–—-]\s*', time_range or '', maxsplit=1)
+    start = parse_timestamp(bounds[0]) if bounds[0] else None
+    end = parse_timestamp(bounds[1]) if len(bounds) > 1 else None
+    return start, end
+
+def clean_turn_text(text: str) -> str:
+    """Collapse line breaks and strip the quotes the model wraps dialogue in"""
+    text = text.replace('\\n', ' ')
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.strip('"\'“”‘’ ').strip()
+
+def split_transcript_turns(transcript: str, default_speaker: str, start: Optional[int]) -> List[Tuple[Optional[int], str, str]]:
+    """Split a segment transcript string into (t, speaker, text) turns"""
+    turns = []
+    matches = list(SPEAKER_TURN_PATTERN.finditer(transcript or ''))
+
+    if not matches:
+        text = clean_turn_text(transcript or '')
+        if text:
+            turns.append((start, default_speaker, text))
+        return turns
+
+    # Text before the first speaker label belongs to the segment's primary speaker
+    leading = clean_turn_text(transcript[:matches[0].start()])
+    if leading:
+        turns.append((start, default_speaker, leading))
+
+    for index, match in enumerate(matches):
+        end_pos = matches[index + 1].start() if index + 1 < len(matches) else len(transcript)
+        text = clean_turn_text(transcript[match.end():end_pos])
+        if not text:
+            continue
+
+        # Unlabelled turns keep t=None here; their time is estimated in assign_turn_times()
+        timestamp = parse_timestamp(match.group(1)) if match.group(1) else None
+        if timestamp is None and not turns:
+            timestamp = start
+        turns.append((timestamp, match.group(2), text))
+
+    return turns
+
+def assign_turn_times(seg_turns: List[Dict[str, Any]], end: Optional[int]):
+    """Fill in start (t) and duration (d) for a segment's turns.
+
+    A labelled turn and the unlabelled turns after it share the time until the next
+    label (or the segment end), split in proportion to text length; those estimated
+    start times are flagged with "est". When no bound is known, t and d stay None.
+    """
+    index = 0
+    while index < len(seg_turns):
+        anchor = seg_turns[index]
+        run_end = index + 1
+        while run_end < len(seg_turns) and seg_turns[run_end]["t"] is None:
+            run_end += 1
+        run = seg_turns[index:run_end]
+        next_t = seg_turns[run_end]["t"] if run_end < len(seg_turns) else end
+
+        if anchor["t"] is None or next_t is None or next_t < anchor["t"]:
+            for turn in run:
+                turn["d"] = None
+            index = run_end
+            continue
+
+        span = next_t - anchor["t"]
+        total_chars = sum(len(turn["text"]) for turn in run) or 1
+        chars_so_far = 0
+        for position, turn in enumerate(run):
+            turn_start = anchor["t"] + round(span * chars_so_far / total_chars)
+            chars_so_far += len(turn["text"])
+            turn_end = anchor["t"] + round(span * chars_so_far / total_chars)
+            if position > 0:
+                turn["t"] = turn_start
+                turn["est"] = True
+            turn["d"] = turn_end - turn_start
+        index = run_end
+
+def coerce_text(value: Any, separator: str) -> str:
+    """Turn a model-supplied field into text; lists are joined, other values go through str()"""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return separator.join(coerce_text(item, separator) for item in value)
+    return str(value)
+
+def build_transcript_index(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Normalize segment transcripts into turns, a speaker table and per-speaker stats"""
+    speakers: List[str] = []
+    speaker_ids: Dict[str, int] = {}
+    turns: List[Dict[str, Any]] = []
+    segment_turns: List[Tuple[int, int]] = []
+
+    def speaker_id(name: str) -> int:
+        if name not in speaker_ids:
+            speaker_ids[name] = len(speakers)
+            speakers.append(name)
+        return speaker_ids[name]
+
+    for seg_index, segment in enumerate(segments):
+        start, end = parse_time_range(coerce_text(segment.get('time_range'), ', '))
+        speaker_field = coerce_text(segment.get('speaker'), ', ') or 'Unknown Speaker'
+        named = SPEAKER_NAME_PATTERN.findall(speaker_field)
+        default_speaker = named[0] if named else speaker_field
+
+        first_turn = len(turns)
+        for t, speaker, text in split_transcript_turns(coerce_text(segment.get('transcript'), '\n\n'), default_speaker, start):
+            turns.append({"t": t, "speaker": speaker_id(speaker), "text": text, "seg": seg_index})
+        segment_turns.append((first_turn, len(turns) - first_turn))
+
+        # Speakers named in the segment header count even without a labelled turn
+        for name in named:
+            speaker_id(name)
+
+        assign_turn_times(turns[first_turn:], end)
+
+    # talk_time stays None for a speaker none of whose turns could be timed
+    speaker_stats = {name: {"talk_time": None, "turns": 0} for name in speakers}
+    for turn in turns:
+        stats = speaker_stats[speakers[turn["speaker"]]]
+        if turn["d"] is not None:
+            stats["talk_time"] = (stats["talk_time"] or 0) + turn["d"]
+        stats["turns"] += 1
+
+    return {
+        "turns": turns,
+        "speakers": speakers,
+        "speaker_stats": speaker_stats,
+        "segment_turns": segment_turns
+    }
+
+def page_bounds(offset_arg: Optional[str], limit_arg: Optional[str], default_limit: int) -> Tuple[int, int]:
+    """Parse offset/limit query arguments, clamping to sane values"""
+    try:
+        offset = max(int(offset_arg or 0), 0)
+        limit = int(limit_arg or default_limit)
+    except ValueError:
+        raise ValueError("offset and limit must be integers")
+    return offset, min(max(limit, 1), 500)
+
+def time_bound(value: Optional[str], name: str) -> Optional[int]:
+    """Parse an optional start/end query argument in seconds"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer number of seconds")
+
+def segment_page(entry: Dict[str, Any], offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Return segment metadata with its first SEGMENT_TURN_LIMIT turns, without the raw transcript string"""
+    index = entry["transcript"]
+    page = []
+    for seg_index in range(offset, min(offset + limit, len(entry["segments"]))):
+        segment = {key: value for key, value in entry["segments"][seg_index].items() if key != 'transcript'}
+        first_turn, turn_count = index["segment_turns"][seg_index]
+        segment["index"] = seg_index
+        segment["turn_offset"] = first_turn
+        segment["turn_count"] = turn_count
+        segment["turns"] = index["turns"][first_turn:first_turn + min(turn_count, SEGMENT_TURN_LIMIT)]
+        page.append(segment)
+    return page
+
+def store_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize an analysis once, keep it for paginated retrieval and return the first page"""
+    segments = result.get('segments') if isinstance(result.get('segments'), list) else []
+    # Keep the content of segments that are not objects instead of failing the whole analysis
+    segments = [segment if isinstance(segment, dict) else {"transcript": coerce_text(segment, '\n\n')} for segment in segments]
+    index = build_transcript_index(segments)
+    analysis_id = str(uuid.uuid4())
+    entry = {"segments": segments, "transcript": index}
+
+    with analysis_store_lock:
+        analysis_store[analysis_id] = entry
+        while len(analysis_store) > MAX_STORED_ANALYSES:
+            analysis_store.popitem(last=False)
+
+    response = {key: value for key, value in result.items() if key != 'segments'}
+    response["analysis_id"] = analysis_id
+    # Stored analyses are lost on worker restarts and eviction, so typical results are returned whole
+    first_page = len(segments) if len(segments) <= INLINE_SEGMENT_LIMIT else SEGMENT_PAGE_SIZE
+    response["segments"] = segment_page(entry, 0, first_page)
+    response["segment_count"] = len(segments)
+    response["transcript"] = {
+        "speakers": index["speakers"],
+        "speaker_stats": index["speaker_stats"],
+        "turn_count": len(index["turns"])
+    }
+    return response
+
+def get_stored_analysis(analysis_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a stored analysis"""
+    with analysis_store_lock:
+        return analysis_store.get(analysis_id)
+
+# -------------------------
+# PROMPT REGISTRY
+# -------------------------
+
+ANALYSIS_INSTRUCTIONS_V1 = """
+Analyze this meeting recording and return valid JSON only. For longer videos, focus on key content and clear structure.
+
+REQUIREMENTS:
+1. Create 3-5 segments maximum (even for long videos)
+2. Summarize main discussion points per segment
+3. Identify speakers as Speaker A, B, C, etc.
+4. Focus on actionable content and decisions
+5. Keep transcript concise but informative
+
+{
+  "file_info": {
+    "filename": "actual_filename_here",
+    "processed_at": "2024-12-14T10:00:00",
+    "analysis_type": "VERTA AI Analysis - Real Gemini Processing",
+    "status": "completed"
+  },
+  "segments": [
+    {
+      "time_range": "00:00–01:30",
+      "speaker": "Speaker A (primary), Speaker B (interrupts at 01:00)",
+      "transcript": "Speaker A: \"Welcome everyone to today's meeting. Let's start by reviewing our agenda and objectives for this session.\"\\n\\n[01:00] Speaker B: \"Sorry to interrupt, but I have an urgent update about the client.\"\\n\\n[01:15] Speaker A: \"Of course, go ahead with your update.\"",
+      "sentiment": "Positive",
+      "sentiment_reason": "Welcoming tone and collaborative interruption handling",
+      "topic": "Meeting opening with urgent client update"
+    },
+    {
+      "time_range": "01:30–03:00",
+      "speaker": "Speaker B (continues), Speaker C (question at 02:30)",
+      "transcript": "Speaker B: 'The client just called with feedback on our proposal. They're mostly satisfied but want some timeline adjustments.'\n\n[02:30] Speaker C: 'What kind of timeline adjustments are they looking for?'\n\nSpeaker B: 'They want to move the delivery date up by two weeks, which might be challenging.'",
+      "sentiment": "Neutral",
+      "sentiment_reason": "Informative update with mixed news and collaborative questioning",
+      "topic": "Client feedback and timeline discussion"
+    }
+  ],
+  "engagement_score": {
+    "score": 85,
+    "explanation": "Detailed analysis of meeting engagement based on participation, interaction quality, and discussion flow"
+  },
+  "meeting_summary": {
+    "key_points": ["Comprehensive point 1", "Detailed point 2", "Important point 3"],
+    "decisions": ["Specific decision made", "Another decision"],
+    "open_questions": ["Unresolved question 1", "Follow-up needed"],
+    "risks_or_concerns": ["Identified risk", "Potential concern"]
+  },
+  "action_items": [
+    {
+      "description": "Specific actionable task with clear details",
+      "owner": "Identified person or speaker name",
+      "priority": "High"
+    }
+  ],
+  "improvement_suggestions": ["Specific suggestion 1", "Actionable suggestion 2"]
+}
+
+🔹 VERTA TRANSCRIPT FORMATTING STANDARD (MANDATORY):
+
+You are the transcript formatter for VERTA – AI Meeting Intelligence Platform.
+Every transcript you generate must be COMPLETE and DETAILED, without exception.
+
+COMPLETE TRANSCRIPTION REQUIREMENTS:
+1. Transcribe EVERY SINGLE WORD spoken - no omissions allowed
+2. Include ALL filler words, hesitations, and speech patterns
+3. Capture interruptions, overlaps, and simultaneous speech
+4. Include background comments and side conversations
+5. Transcribe exactly as spoken - do not clean up or improve grammar
+6. Show stammers, repetitions, and false starts literally
+
+FORMATTING RULES:
+1. Merge consecutive dialogue from the same speaker into a single paragraph
+2. Display timestamps only when the speaker changes
+3. Preserve speaker labels exactly (Speaker A, Speaker B, etc.)
+4. Do not paraphrase or modify ANY spoken content
+5. Insert one blank line (\\n\\n) between different speakers' blocks
+6. Output must be complete, detailed, and professional
+
+REQUIRED OUTPUT STRUCTURE:
+"Speaker A: \\"Merged dialogue text from that speaker...\\"\\n\\n[timestamp] Speaker B: \\"Merged dialogue text from that speaker...\\"\\n\\n[timestamp] Speaker C: \\"Merged dialogue text from that speaker...\\""
+
+CORRECT EXAMPLE:
+"Speaker A: \"Welcome to our department meeting and nice to see you all. Now we have a new team member, Trudi Finch, our HR manager. So I'd like to start with some introductions. As you are aware, I'm the senior team manager, Carole Fletcher. Peter.\"\\n\\n[00:54] Speaker C: \"Hi, I'm Peter Morgan, Finance Manager, with a team of five reporting to me.\"\\n\\n[00:59] Speaker D: \"And I'm, we haven't met yet, I'm Frank Mayfair, Head of IT, I've been here for the last 10 years.\"\\n\\n[01:03] Speaker E: \"Hi Trudi, I'm Mike Reynard. We spoke on the phone last week. I'm in charge of the production floor. Came in 15% cheaper. That is a significant amount.\"\\n\\n[01:13] Speaker A: \"Okay, Peter, go ahead and purchase on the proviso that the quality and guarantee are just as good.\""
+
+CRITICAL: COMPLETE TRANSCRIPTION MANDATE
+- Do NOT skip any spoken words, even if they seem unimportant
+- Do NOT summarize or paraphrase - transcribe literally
+- Include EVERY "um", "uh", "like", "you know", etc.
+- Capture ALL interruptions and overlapping speech
+- Show EVERY speaker change, no matter how brief
+- For longer videos: More segments with MORE complete detail
+
+Return ONLY the JSON object with COMPLETE transcripts, no markdown, no explanations, no code blocks.
+"""
+
+# Fixed instructions per prompt name and version; only the short task suffix is sent with each request
+PROMPT_REGISTRY: Dict[str, Dict[str, Dict[str, str]]] = {
+    "analysis": {
+        "v1": {
+            "instructions": ANALYSIS_INSTRUCTIONS_V1,
+            "task": "Analyze the attached meeting recording following your instructions and return ONLY the JSON object."
+        }
+    }
+}
+
+# Version used when the requested one is not in the registry
+DEFAULT_PROMPT_VERSIONS = {"analysis": "v1"}
+
+def compile_prompt(name: str, version: str) -> Dict[str, Any]:
+    """Resolve a prompt version from the registry and precompute what every request reuses"""
+    versions = PROMPT_REGISTRY[name]
+    if version not in versions:
+        fallback = DEFAULT_PROMPT_VERSIONS[name]
+        logger.warning(f"Unknown {name} prompt version {version}, using {fallback}")
+        version = fallback
+
+    instructions = versions[version]["instructions"].strip()
+    task = versions[version]["task"].strip()
+    return {
+        "id": f"{name}@{version}",
+        "version": version,
+        "instructions": instructions,
+        "task": task,
+        "inline": f"{instructions}\n\n{task}",
+        "hash": hashlib.sha256(instructions.encode('utf-8')).hexdigest()[:12]
+    }
+
+# Compiled once at startup
+analysis_prompt = compile_prompt("analysis", ANALYSIS_PROMPT_VERSION)
+
+# Provider-side cached context holding the analysis instructions
+prompt_cache_state: Dict[str, Any] = {
+    "content": None,
+    "expires_at": 0.0,
+    "model_name": None,
+    "disabled_until": 0.0,
+    "last_error": None
+}
+prompt_cache_lock = threading.Lock()
+
+def get_cached_prompt_model(genai, model_name: str):
+    """Return a model bound to a cached context holding the analysis instructions, or None"""
+    caching = getattr(genai, 'caching', None)
+    if not PROMPT_CACHE_ENABLED or caching is None:
+        return None
+
+    with prompt_cache_lock:
+        now = time.time()
+        if now < prompt_cache_state["disabled_until"]:
+            return None
+
+        content = prompt_cache_state["content"]
+        if content is not None and prompt_cache_state["model_name"] != model_name:
+            content = None
+
+        # Extend the cached context shortly before it expires instead of letting it lapse
+        if content is not None and prompt_cache_state["expires_at"] - now < PROMPT_CACHE_REFRESH_MARGIN:
+            try:
+                content.update(ttl=timedelta(seconds=PROMPT_CACHE_TTL))
+                prompt_cache_state["expires_at"] = now + PROMPT_CACHE_TTL
+                logger.info(f"Refreshed cached prompt context for {analysis_prompt['id']}")
+            except Exception as e:
+                logger.warning(f"Cached prompt refresh failed, recreating: {e}")
+                content = None
+
+        if content is None:
+            try:
+                content = caching.CachedContent.create(
+                    model=model_name,
+                    display_name=f"verta-{analysis_prompt['id']}-{analysis_prompt['hash']}",
+                    system_instruction=analysis_prompt["instructions"],
+                    ttl=timedelta(seconds=PROMPT_CACHE_TTL)
+                )
+            except Exception as e:
+                # Usually the instructions are below the model's minimum cacheable size; back off for a TTL
+                prompt_cache_state.update(content=None, disabled_until=now + PROMPT_CACHE_TTL, last_error=truncate_for_log(e))
+                logger.warning(f"Prompt context caching unavailable, using system instruction: {truncate_for_log(e)}")
+                return None
+
+            prompt_cache_state.update(content=content, expires_at=now + PROMPT_CACHE_TTL, model_name=model_name, last_error=None)
+            logger.info(f"Created cached prompt context for {analysis_prompt['id']} on {model_name}")
+
+    return genai.GenerativeModel.from_cached_content(cached_content=content)
+
+def get_analysis_model(genai, model):
+    """Pick the cheapest way to send the instructions: cached context, system instruction or inline"""
+    cached_model = get_cached_prompt_model(genai, gemini_state["model_name"])
+    if cached_model is not None:
+        return cached_model, "cached_context", [analysis_prompt["task"]]
+    if gemini_state["prompt_mode"] == "system_instruction":
+        return model, "system_instruction", [analysis_prompt["task"]]
+    return model, "inline", [analysis_prompt["inline"]]
+
+def prompt_file_info(prompt_mode: str, ai_response) -> Dict[str, Any]:
+    """Prompt version and token usage recorded in file_info for A/B comparison"""
+    info = {
+        "prompt_id": analysis_prompt["id"],
+        "prompt_version": analysis_prompt["version"],
+        "prompt_hash": analysis_prompt["hash"],
+        "prompt_mode": prompt_mode
+    }
+    usage = getattr(ai_response, 'usage_metadata', None)
+    if usage is not None:
+        info["usage"] = {
+            "prompt_tokens": getattr(usage, 'prompt_token_count', None),
+            "cached_tokens": getattr(usage, 'cached_content_token_count', None),
+            "output_tokens": getattr(usage, 'candidates_token_count', None)
+        }
+    return info
+
+# -------------------------
+# STARTUP WARM-UP
+# -------------------------
+
+# Shared state for import profiling, warm-up progress and the pre-initialized Gemini client
+startup_state: Dict[str, Any] = {
+    "ready": False,
+    "mode": WARMUP_MODE,
+    "started_at": None,
+    "duration_ms": None,
+    "import_timings": {},
+    "model_name": None,
+    "prompt_id": analysis_prompt["id"],
+    "errors": []
+}
+# Guards startup_state: the background warm-up thread writes while /readyz reads
+startup_lock = threading.Lock()
+gemini_state: Dict[str, Any] = {"genai": None, "model": None, "api_key": None, "model_name": None, "prompt_mode": None}
+gemini_lock = threading.Lock()
+
+def profile_import(module_name: str) -> Dict[str, Any]:
+    """Import a module and record how long it took and how many modules it pulled in"""
+    if module_name in sys.modules:
+        timing = {"ms": 0.0, "new_modules": 0, "cached": True}
+    else:
+        before = len(sys.modules)
+        started = time.perf_counter()
+        importlib.import_module(module_name)
+        timing = {
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "new_modules": len(sys.modules) - before,
+            "cached": False
+        }
+
+    with startup_lock:
+        startup_state["import_timings"][module_name] = timing
+    return timing
+
+def get_gemini_model(api_key: str):
+    """Return the configured genai module and the first model that initializes, cached per API key"""
+    with gemini_lock:
+        if gemini_state["model"] is not None and gemini_state["api_key"] == api_key:
+            return gemini_state["genai"], gemini_state["model"]
+
+        genai = importlib.import_module(GENAI_PROVIDER_MODULE)
+
+        genai.configure(api_key=api_key)
+
+        # Try different model names - prioritize Gemini 2.5 Flash
+        for model_name in GEMINI_MODEL_NAMES:
+            try:
+                try:
+                    model = genai.GenerativeModel(model_name, system_instruction=analysis_prompt["instructions"])
+                    prompt_mode = "system_instruction"
+                except TypeError:
+                    # SDKs without system instructions get the instructions inline with each request
+                    model = genai.GenerativeModel(model_name)
+                    prompt_mode = "inline"
+                logger.info(f"Successfully initialized model: {model_name} ({prompt_mode})")
+                break
+            except Exception as e:
+                logger.warning(f"Failed to initialize {model_name}: {e}")
+                continue
+        else:
+            raise Exception("No available Gemini model found")
+
+        gemini_state.update({"genai": genai, "model": model, "api_key": api_key, "model_name": model_name, "prompt_mode": prompt_mode})
+        with startup_lock:
+            startup_state["model_name"] = model_name
+        return genai, model
+
+def record_warm_up_error(error: str):
+    """Keep a warm-up failure for /readyz"""
+    with startup_lock:
+        startup_state["errors"].append(error)
+
+def warm_up_imports():
+    """Pre-import heavy modules, recording per-module import cost"""
+    for module_name in WARMUP_MODULES:
+        try:
+            timing = profile_import(module_name)
+            logger.info(f"Warm-up import {module_name}: {timing['ms']}ms ({timing['new_modules']} modules)")
+        except Exception as e:
+            logger.warning(f"Warm-up import failed for {module_name}: {e}")
+            record_warm_up_error(f"{module_name}: {e}")
+
+def warm_up_clients():
+    """Configure the Gemini model and build the SDK's service clients.
+
+    configure() and GenerativeModel() only store settings; the SDK creates its gRPC
+    clients on first use, so they are created here instead of in the first /analyze.
+    Clients must not cross a fork, so under gunicorn this runs in each worker.
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return
+
+    try:
+        genai, _ = get_gemini_model(api_key)
+    except Exception as e:
+        logger.warning(f"Warm-up model initialization failed: {e}")
+        record_warm_up_error(f"model: {e}")
+        return
+
+    client_module = getattr(genai, 'client', None)
+    for factory_name in GEMINI_CLIENT_FACTORIES:
+        factory = getattr(client_module, factory_name, None)
+        if factory is None:
+            continue
+        try:
+            factory()
+        except Exception as e:
+            logger.warning(f"Warm-up client {factory_name} failed: {e}")
+            record_warm_up_error(f"{factory_name}: {e}")
+
+def warm_up(include_imports: bool = True):
+    """Run the warm-up and mark the process ready"""
+    started = time.perf_counter()
+    with startup_lock:
+        startup_state["started_at"] = datetime.now().isoformat()
+
+    if include_imports:
+        warm_up_imports()
+    warm_up_clients()
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    with startup_lock:
+        startup_state["duration_ms"] = duration_ms
+        startup_state["ready"] = True
+    logger.info(f"Warm-up complete in {duration_ms}ms")
+
+def run_warm_up(include_imports: bool = True):
+    """Run warm_up() inline or in a thread according to WARMUP_MODE"""
+    if WARMUP_MODE == "sync":
+        warm_up(include_imports)
+    else:
+        threading.Thread(target=warm_up, args=(include_imports,), name="verta-warm-up", daemon=True).start()
+
+def start_warm_up():
+    """Warm up at import time.
+
+    When a preforking server imports the app (WARMUP_PER_WORKER), only the imports run
+    here, inline, so no thread or lock is held across the fork; start_worker_warm_up()
+    finishes the warm-up in each worker.
+    """
+    if WARMUP_MODE == "off":
+        with startup_lock:
+            startup_state["ready"] = True
+    elif WARMUP_PER_WORKER:
+        warm_up_imports()
+    else:
+        run_warm_up()
+
+def start_worker_warm_up():
+    """Finish the warm-up in a freshly forked worker"""
+    if WARMUP_MODE != "off":
+        run_warm_up(include_imports=False)
+
+# Probe paths that skip access logging entirely
+UNLOGGED_PATHS = {'/livez'}
+# High-frequency paths whose access records are sampled
+HEALTH_PATHS = {'/health', '/readyz'}
+# Caller-supplied ids are echoed into logs and headers, so only short plain tokens are trusted
+REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+@app.before_request
+def assign_request_id():
+    """Give every request a correlation id, reusing the caller's when it is well-formed"""
+    caller_id = request.headers.get('X-Request-ID', '')
+    g.request_id = caller_id if REQUEST_ID_PATTERN.fullmatch(caller_id) else uuid.uuid4().hex[:16]
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def log_request(response):
+    """Return the correlation id and emit one structured access record"""
+    response.headers['X-Request-ID'] = g.get('request_id', '-')
+
+    if request.path not in UNLOGGED_PATHS:
+        logger.info("request completed", extra={
+            "event": "health_check" if request.path in HEALTH_PATHS else "request",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000, 1)
+        })
+    return response
+
 # Routes
 @app.route('/')
 def home():
@@ -202,8 +968,12 @@ def home():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "livez": "/livez",
+            "readyz": "/readyz",
             "upload": "/upload",
-            "analyze": "/analyze"
+            "analyze": "/analyze",
+            "segments": "/analysis/<analysis_id>/segments",
+            "turns": "/analysis/<analysis_id>/turns"
         },
         "message": "VERTA backend is running successfully!"
     })
@@ -211,7 +981,6 @@ def home():
 @app.route('/health')
 def health():
     """Health check endpoint for Render"""
-    logger.info("Health check accessed")
     api_key = os.getenv("GEMINI_API_KEY")
     
     return jsonify({
@@ -223,6 +992,23 @@ def health():
         "environment": "production" if os.getenv("RENDER") else "development"
     })
 
+@app.route('/livez')
+def livez():
+    """Liveness probe - answers as soon as the process serves requests"""
+    return jsonify({"status": "alive"})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe - succeeds once the warm-up has finished"""
+    with startup_lock:
+        snapshot = copy.deepcopy(startup_state)
+
+    status_code = 200 if snapshot["ready"] else 503
+    return jsonify({
+        "status": "ready" if snapshot["ready"] else "warming_up",
+        "warmup": snapshot
+    }), status_code
+
 @app.route('/upload', methods=['POST', 'OPTIONS'])
 def upload_file():
     """Handle file upload"""
@@ -334,30 +1120,13 @@ def analyze_file():
         if api_key:
             logger.info("API key found, attempting real AI analysis...")
             try:
-                import google.generativeai as genai
-                
-                genai.configure(api_key=api_key)
-                
-                # Try different model names - prioritize Gemini 2.5 Flash
-                model_names = ["models/gemini-2.5-flash", "models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
-                model = None
-                
-                for model_name in model_names:
-                    try:
-                        model = genai.GenerativeModel(model_name)
-                        logger.info(f"Successfully initialized model: {model_name}")
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to initialize {model_name}: {e}")
-                        continue
-                
-                if not model:
-                    raise Exception("No available Gemini model found")
+                # Reuses the client pre-initialized during warm-up when available
+                genai, model = get_gemini_model(api_key)
                 
                 # Upload content with better error handling
                 try:
                     media = genai.upload_file(temp_path)
-                    logger.info(f"File uploaded to Gemini: {media}")
+                    logger.info(f"File uploaded to Gemini: {truncate_for_log(media)}")
                 except Exception as e:
                     logger.error(f"File upload failed: {e}")
                     raise Exception(f"Failed to upload file to Gemini: {e}")
@@ -373,7 +1142,7 @@ def analyze_file():
                 while elapsed_time < max_wait_time:
                     try:
                         file_status = genai.get_file(media.name)
-                        logger.info(f"File status check at {elapsed_time}s: {file_status.state}")
+                        logger.info(f"File status check at {elapsed_time}s: {file_status.state}", extra={"event": "poll_tick"})
                         
                         if file_status.state.name == 'ACTIVE':
                             logger.info("✅ File is now ACTIVE and ready for processing!")
@@ -382,7 +1151,7 @@ def analyze_file():
                             raise Exception(f"File processing failed on Gemini servers: {file_status.state}")
                         else:
                             # File is still processing, wait and check again
-                            logger.info(f"File still processing... waiting {check_interval} more seconds")
+                            logger.info(f"File still processing... waiting {check_interval} more seconds", extra={"event": "poll_tick"})
                             time.sleep(check_interval)
                             elapsed_time += check_interval
                             
@@ -411,99 +1180,9 @@ def analyze_file():
                     logger.error(f"Final status check failed: {e}")
                     raise Exception(f"Unable to verify file status: {e}")
                 
-                # Optimized prompt for longer videos to avoid API limits
-                prompt = """
-                Analyze this meeting recording and return valid JSON only. For longer videos, focus on key content and clear structure.
-
-                REQUIREMENTS:
-                1. Create 3-5 segments maximum (even for long videos)
-                2. Summarize main discussion points per segment
-                3. Identify speakers as Speaker A, B, C, etc.
-                4. Focus on actionable content and decisions
-                5. Keep transcript concise but informative
-
-                {
-                  "file_info": {
-                    "filename": "actual_filename_here",
-                    "processed_at": "2024-12-14T10:00:00",
-                    "analysis_type": "VERTA AI Analysis - Real Gemini Processing",
-                    "status": "completed"
-                  },
-                  "segments": [
-                    {
-                      "time_range": "00:00–01:30",
-                      "speaker": "Speaker A (primary), Speaker B (interrupts at 01:00)",
-                      "transcript": "Speaker A: \"Welcome everyone to today's meeting. Let's start by reviewing our agenda and objectives for this session.\"\\n\\n[01:00] Speaker B: \"Sorry to interrupt, but I have an urgent update about the client.\"\\n\\n[01:15] Speaker A: \"Of course, go ahead with your update.\"",
-                      "sentiment": "Positive",
-                      "sentiment_reason": "Welcoming tone and collaborative interruption handling",
-                      "topic": "Meeting opening with urgent client update"
-                    },
-                    {
-                      "time_range": "01:30–03:00",
-                      "speaker": "Speaker B (continues), Speaker C (question at 02:30)",
-                      "transcript": "Speaker B: 'The client just called with feedback on our proposal. They're mostly satisfied but want some timeline adjustments.'\n\n[02:30] Speaker C: 'What kind of timeline adjustments are they looking for?'\n\nSpeaker B: 'They want to move the delivery date up by two weeks, which might be challenging.'",
-                      "sentiment": "Neutral",
-                      "sentiment_reason": "Informative update with mixed news and collaborative questioning",
-                      "topic": "Client feedback and timeline discussion"
-                    }
-                  ],
-                  "engagement_score": {
-                    "score": 85,
-                    "explanation": "Detailed analysis of meeting engagement based on participation, interaction quality, and discussion flow"
-                  },
-                  "meeting_summary": {
-                    "key_points": ["Comprehensive point 1", "Detailed point 2", "Important point 3"],
-                    "decisions": ["Specific decision made", "Another decision"],
-                    "open_questions": ["Unresolved question 1", "Follow-up needed"],
-                    "risks_or_concerns": ["Identified risk", "Potential concern"]
-                  },
-                  "action_items": [
-                    {
-                      "description": "Specific actionable task with clear details",
-                      "owner": "Identified person or speaker name",
-                      "priority": "High"
-                    }
-                  ],
-                  "improvement_suggestions": ["Specific suggestion 1", "Actionable suggestion 2"]
-                }
-
-                🔹 VERTA TRANSCRIPT FORMATTING STANDARD (MANDATORY):
-                
-                You are the transcript formatter for VERTA – AI Meeting Intelligence Platform.
-                Every transcript you generate must be COMPLETE and DETAILED, without exception.
-                
-                COMPLETE TRANSCRIPTION REQUIREMENTS:
-                1. Transcribe EVERY SINGLE WORD spoken - no omissions allowed
-                2. Include ALL filler words, hesitations, and speech patterns
-                3. Capture interruptions, overlaps, and simultaneous speech
-                4. Include background comments and side conversations
-                5. Transcribe exactly as spoken - do not clean up or improve grammar
-                6. Show stammers, repetitions, and false starts literally
-                
-                FORMATTING RULES:
-                1. Merge consecutive dialogue from the same speaker into a single paragraph
-                2. Display timestamps only when the speaker changes
-                3. Preserve speaker labels exactly (Speaker A, Speaker B, etc.)
-                4. Do not paraphrase or modify ANY spoken content
-                5. Insert one blank line (\\n\\n) between different speakers' blocks
-                6. Output must be complete, detailed, and professional
-                
-                REQUIRED OUTPUT STRUCTURE:
-                "Speaker A: \\"Merged dialogue text from that speaker...\\"\\n\\n[timestamp] Speaker B: \\"Merged dialogue text from that speaker...\\"\\n\\n[timestamp] Speaker C: \\"Merged dialogue text from that speaker...\\""
-                
-                CORRECT EXAMPLE:
-                "Speaker A: \"Welcome to our department meeting and nice to see you all. Now we have a new team member, Trudi Finch, our HR manager. So I'd like to start with some introductions. As you are aware, I'm the senior team manager, Carole Fletcher. Peter.\"\\n\\n[00:54] Speaker C: \"Hi, I'm Peter Morgan, Finance Manager, with a team of five reporting to me.\"\\n\\n[00:59] Speaker D: \"And I'm, we haven't met yet, I'm Frank Mayfair, Head of IT, I've been here for the last 10 years.\"\\n\\n[01:03] Speaker E: \"Hi Trudi, I'm Mike Reynard. We spoke on the phone last week. I'm in charge of the production floor. Came in 15% cheaper. That is a significant amount.\"\\n\\n[01:13] Speaker A: \"Okay, Peter, go ahead and purchase on the proviso that the quality and guarantee are just as good.\""
-
-                CRITICAL: COMPLETE TRANSCRIPTION MANDATE
-                - Do NOT skip any spoken words, even if they seem unimportant
-                - Do NOT summarize or paraphrase - transcribe literally
-                - Include EVERY "um", "uh", "like", "you know", etc.
-                - Capture ALL interruptions and overlapping speech
-                - Show EVERY speaker change, no matter how brief
-                - For longer videos: More segments with MORE complete detail
-                
-                Return ONLY the JSON object with COMPLETE transcripts, no markdown, no explanations, no code blocks.
-                """
+                # Fixed instructions travel as a cached context or system instruction; each call adds only the task and media
+                analysis_model, prompt_mode, prompt_parts = get_analysis_model(genai, model)
+                logger.info(f"Using prompt {analysis_prompt['id']} via {prompt_mode}")
                 
                 # Generate content with retry logic for longer videos
                 max_retries = 3
@@ -514,8 +1193,8 @@ def analyze_file():
                         logger.info(f"Gemini analysis attempt {attempt + 1}/{max_retries}")
                         
                         # Use shorter timeout for longer videos to avoid 500 errors
-                        ai_response = model.generate_content(
-                            [prompt, media],
+                        ai_response = analysis_model.generate_content(
+                            [*prompt_parts, media],
                             generation_config=genai.types.GenerationConfig(
                                 max_output_tokens=4000,  # Limit output for stability
                                 temperature=0.1,  # Lower temperature for more consistent output
@@ -537,7 +1216,8 @@ def analyze_file():
                             raise e
                 
                 # Log the raw response for debugging
-                logger.info(f"Raw Gemini response (first 500 chars): {ai_response.text[:500]}")
+                logger.info(f"Raw Gemini response received ({len(ai_response.text)} chars)")
+                logger.debug(f"Raw Gemini response: {truncate_for_log(ai_response.text)}")
                 
                 # Parse JSON output with robust error handling for longer videos
                 try:
@@ -590,33 +1270,35 @@ def analyze_file():
                     result['file_info']['analysis_type'] = "VERTA AI Analysis - Real Gemini Processing"
                     result['file_info']['processed_at'] = datetime.now().isoformat()
                     result['file_info']['status'] = "completed"
+                    result['file_info'].update(prompt_file_info(prompt_mode, ai_response))
                     
                     # Ensure segments exist and are properly formatted
                     if 'segments' not in result or not isinstance(result['segments'], list):
                         result['segments'] = []
                     
                     logger.info("✅ Real AI analysis successful for longer video!")
-                    response = jsonify(result)
+                    response = jsonify(store_analysis(result))
                     return add_cors_headers(response), 200
                     
                 except (json.JSONDecodeError, ValueError) as e:
                     logger.warning(f"JSON parsing failed for longer video: {e}")
-                    logger.warning(f"Response text (first 500 chars): {ai_response.text[:500]}...")
+                    logger.warning(f"Response text: {truncate_for_log(ai_response.text)}")
                     
                     # Create fallback with partial AI content for longer videos
                     result = create_sample_analysis(uploaded_file.filename)
                     result["ai_raw_response"] = ai_response.text[:2000]  # Include more content
                     result["note"] = f"AI analysis completed but JSON parsing failed: {str(e)}"
                     result["file_info"]["analysis_type"] = "VERTA AI Analysis - Partial Processing"
+                    result["file_info"].update(prompt_file_info(prompt_mode, ai_response))
                     
-                    response = jsonify(result)
+                    response = jsonify(store_analysis(result))
                     return add_cors_headers(response), 200
                     
                 except Exception as e:
                     logger.warning(f"Unexpected parsing error for longer video: {e}")
                     result = create_sample_analysis(uploaded_file.filename)
                     result["note"] = f"Processing error: {str(e)}"
-                    response = jsonify(result)
+                    response = jsonify(store_analysis(result))
                     return add_cors_headers(response), 200
                     
             except Exception as e:
@@ -634,18 +1316,73 @@ def analyze_file():
                     result["note"] = f"AI processing failed: {str(e)}. Using sample analysis."
                     result["file_info"]["analysis_type"] = "VERTA AI Analysis - Processing Error Fallback"
                 
-                response = jsonify(result)
+                response = jsonify(store_analysis(result))
                 return add_cors_headers(response), 200
         else:
             logger.info("No API key found, using sample analysis")
             result = create_sample_analysis(uploaded_file.filename)
-            return jsonify(result), 200
+            return jsonify(store_analysis(result)), 200
 
     except Exception as e:
         logger.error(f"Analysis error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/analysis/<analysis_id>/segments')
+def get_segments(analysis_id):
+    """Return a page of segments with their pre-parsed turns"""
+    entry = get_stored_analysis(analysis_id)
+    if not entry:
+        return jsonify({"error": "Analysis not found"}), 404
+
+    try:
+        offset, limit = page_bounds(request.args.get('offset'), request.args.get('limit'), SEGMENT_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    total = len(entry["segments"])
+    return jsonify({
+        "analysis_id": analysis_id,
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "has_more": offset + limit < total,
+        "segments": segment_page(entry, offset, limit)
+    })
+
+@app.route('/analysis/<analysis_id>/turns')
+def get_turns(analysis_id):
+    """Return a page of turns, optionally restricted to a time range in seconds"""
+    entry = get_stored_analysis(analysis_id)
+    if not entry:
+        return jsonify({"error": "Analysis not found"}), 404
+
+    try:
+        offset, limit = page_bounds(request.args.get('offset'), request.args.get('limit'), TURN_PAGE_SIZE)
+        start = time_bound(request.args.get('start'), 'start')
+        end = time_bound(request.args.get('end'), 'end')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    turns = entry["transcript"]["turns"]
+    if start is not None or end is not None:
+        turns = [
+            turn for turn in turns
+            if turn["t"] is not None
+            and (start is None or turn["t"] >= start)
+            and (end is None or turn["t"] < end)
+        ]
+
+    return jsonify({
+        "analysis_id": analysis_id,
+        "offset": offset,
+        "limit": limit,
+        "total": len(turns),
+        "has_more": offset + limit < len(turns),
+        "speakers": entry["transcript"]["speakers"],
+        "turns": turns[offset:offset + limit]
+    })
+
 @app.route('/debug')
 def debug():
     """Debug endpoint"""
@@ -657,11 +1394,10 @@ def debug():
     
     if api_key:
         try:
-            import google.generativeai as genai
+            genai = importlib.import_module(GENAI_PROVIDER_MODULE)
             genai.configure(api_key=api_key)
             
-            model_names = ["models/gemini-2.5-flash", "models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
-            for model_name in model_names:
+            for model_name in GEMINI_MODEL_NAMES:
                 try:
                     model = genai.GenerativeModel(model_name)
                     model_status[model_name] = "✅ Available"
@@ -700,6 +1436,9 @@ def internal_error(error):
     logger.error(f"500 error: {str(error)}")
     return jsonify({"error": "Internal server error"}), 500
 
+# Warm up heavy clients as soon as the app is imported (in the gunicorn master when preloading)
+start_warm_up()
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     logger.info(f"Starting VERTA backend on port {port}")
@@ -17,7 +17,7 @@ max_requests = 100
 max_requests_jitter = 10
 
 # Logging
-accesslog = "-"
+accesslog = None  # The app emits sampled JSON access records with request ids
 errorlog = "-"
 loglevel = "info"
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
@@ -27,6 +27,12 @@ proc_name = "verta-ai-backend"
 
 # Server mechanics
 preload_app = True
+
+# Heavy imports are warmed once in the master while the app is preloaded, so every
+# forked worker (including max_requests restarts) inherits them; Gemini clients and
+# readiness are per worker, finished in post_fork. Forced: a warm-up thread started
+# in the master would not exist in the workers.
+os.environ["WARMUP_PER_WORKER"] = "true"
 daemon = False
 pidfile = None
 user = None
@@ -35,4 +41,10 @@ tmp_upload_dir = None
 
 # SSL (not needed for Render)
 keyfile = None
-certfile = None
\ No newline at end of file
+certfile = None
+
+def post_fork(server, worker):
+    # The background log writer thread started in the preloaded master does not survive the fork
+    import backend
+    backend.start_log_writer()
+    backend.start_worker_warm_up()
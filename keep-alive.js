@@ -8,7 +8,7 @@ async function pingBackend() {
     try {
         console.log(`🏓 Pinging backend at ${new Date().toISOString()}`);
         
-        const response = await fetch(`${BACKEND_URL}/health`, {
+        const response = await fetch(`${BACKEND_URL}/livez`, {
             method: 'GET',
             headers: {
                 'User-Agent': 'VERTA-KeepAlive/1.0'
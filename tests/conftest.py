@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Keep imports of the app offline and quiet: no warm-up thread, warnings only
+os.environ.setdefault("WARMUP_MODE", "off")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,125 @@
+"""
+Local fake of the google.generativeai API surface used by backend.py.
+
+Select it with GENAI_PROVIDER_MODULE=fake_genai (tests/ must be on sys.path).
+Calls are recorded in `calls`; `reset()` restores the default behaviour.
+"""
+
+import json
+from types import SimpleNamespace
+
+RESPONSE = {
+    "segments": [
+        {
+            "time_range": "00:00–01:00",
+            "speaker": "Speaker A, Speaker B",
+            "transcript": "Speaker A: \"Welcome.\"\n\n[00:30] Speaker B: \"Thanks.\""
+        }
+    ]
+}
+
+calls = {}
+settings = {}
+
+
+def reset(caching_supported=True, system_instruction_supported=True):
+    """Clear recorded calls and choose which optional provider features exist"""
+    calls.update(configure=0, create=0, update=0, generate=[], clients=[])
+    settings.update(system_instruction_supported=system_instruction_supported)
+
+    global caching
+    if caching_supported:
+        caching = SimpleNamespace(CachedContent=CachedContent)
+    elif 'caching' in globals():
+        del caching
+
+
+def configure(api_key):
+    calls["configure"] += 1
+
+
+class _File:
+    name = "files/fake"
+    state = SimpleNamespace(name="ACTIVE")
+
+
+def upload_file(path):
+    return _File()
+
+
+def get_file(name):
+    return _File()
+
+
+types = SimpleNamespace(GenerationConfig=lambda **kwargs: kwargs)
+
+
+def _client_factory(name):
+    def factory():
+        calls["clients"].append(name)
+        return SimpleNamespace(name=name)
+    return factory
+
+
+# Mirrors google.generativeai.client, which builds the service clients on first use
+client = SimpleNamespace(**{
+    name: _client_factory(name)
+    for name in ("get_default_generative_client", "get_default_file_client", "get_default_cache_client")
+})
+
+
+class _Response:
+    def __init__(self, prompt_tokens, cached_tokens):
+        self.text = json.dumps(RESPONSE)
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            cached_content_token_count=cached_tokens,
+            candidates_token_count=42
+        )
+
+
+class GenerativeModel:
+    def __init__(self, model_name, system_instruction=None, cached_content=None):
+        if system_instruction is not None and not settings["system_instruction_supported"]:
+            raise TypeError("unexpected keyword argument 'system_instruction'")
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.cached_content = cached_content
+
+    @classmethod
+    def from_cached_content(cls, cached_content):
+        return cls(cached_content.model, cached_content=cached_content)
+
+    def generate_content(self, contents, generation_config=None):
+        text = [part for part in contents if isinstance(part, str)]
+        calls["generate"].append({
+            "text": text,
+            "system_instruction": self.system_instruction,
+            "cached_content": self.cached_content
+        })
+
+        # Roughly four characters per token, as the real API reports
+        cached_tokens = len(self.cached_content.system_instruction) // 4 if self.cached_content else 0
+        instruction_tokens = len(self.system_instruction or '') // 4
+        prompt_tokens = sum(len(part) for part in text) // 4 + instruction_tokens + cached_tokens
+        return _Response(prompt_tokens, cached_tokens)
+
+
+class CachedContent:
+    def __init__(self, model, display_name, system_instruction, ttl):
+        self.model = model
+        self.display_name = display_name
+        self.system_instruction = system_instruction
+        self.ttl = ttl
+
+    @classmethod
+    def create(cls, model, display_name=None, system_instruction=None, ttl=None):
+        calls["create"] += 1
+        return cls(model, display_name, system_instruction, ttl)
+
+    def update(self, ttl=None):
+        calls["update"] += 1
+        self.ttl = ttl
+
+
+reset()
@@ -0,0 +1,99 @@
+import json
+import logging
+import queue
+
+import pytest
+
+import backend
+
+
+@pytest.fixture
+def captured():
+    """Collect records as the queue handler would hand them to the writer thread"""
+    records = queue.Queue()
+    handler = backend.StructuredQueueHandler(records)
+    handler.addFilter(backend.RequestContextFilter())
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.INFO)
+    root.addHandler(handler)
+    yield lambda: [records.get_nowait() for _ in range(records.qsize())]
+    root.removeHandler(handler)
+    root.setLevel(level)
+
+
+def info_record(event):
+    return logging.makeLogRecord({"levelno": logging.INFO, "levelname": "INFO", "event": event})
+
+
+def test_sampling_keeps_one_in_n_and_every_warning():
+    sampler = backend.SamplingFilter({"health_check": 0.25})
+
+    kept = [sampler.filter(info_record("health_check")) for _ in range(8)]
+    warning = logging.makeLogRecord({"levelno": logging.WARNING, "event": "health_check"})
+
+    assert kept == [True, False, False, False, True, False, False, False]
+    assert all(sampler.filter(warning) for _ in range(3))
+    assert sampler.filter(info_record("request"))
+
+
+def test_sampling_rate_zero_drops_info_but_not_errors():
+    sampler = backend.SamplingFilter({"poll_tick": 0})
+
+    assert not sampler.filter(info_record("poll_tick"))
+    assert sampler.filter(logging.makeLogRecord({"levelno": logging.ERROR, "event": "poll_tick"}))
+
+
+def test_traceback_is_logged_as_its_own_field():
+    try:
+        raise ValueError("bad segment")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 0, "analysis failed", None, backend.sys.exc_info()
+        )
+
+    prepared = backend.StructuredQueueHandler(queue.Queue()).prepare(record)
+    entry = json.loads(backend.JsonFormatter().format(prepared))
+
+    assert entry["msg"] == "analysis failed"
+    assert entry["exc"].startswith("Traceback")
+    assert "ValueError: bad segment" in entry["exc"]
+    assert record.exc_info is not None  # the caller's record is left untouched
+
+
+def test_records_inside_a_request_carry_its_id(captured):
+    with backend.app.test_request_context('/analyze', headers={'X-Request-ID': 'req-42'}):
+        backend.assign_request_id()
+        backend.logger.warning("inside the request")
+    backend.logger.warning("outside any request")
+
+    inside, outside = captured()
+    assert inside.request_id == "req-42"
+    assert outside.request_id == "-"
+
+
+def test_access_record_uses_request_id_and_livez_is_not_logged(captured):
+    client = backend.app.test_client()
+
+    client.get('/livez', headers={'X-Request-ID': 'probe-1'})
+    client.get('/analysis/missing/segments', headers={'X-Request-ID': 'page-1'})
+
+    access = [record for record in captured() if record.getMessage() == "request completed"]
+    assert [record.path for record in access] == ['/analysis/missing/segments']
+    assert access[0].request_id == 'page-1'
+    assert access[0].status == 404
+
+
+@pytest.mark.parametrize("header", ["", "x" * 65, "abc def", "id;forged=1", "<script>"])
+def test_malformed_request_ids_are_replaced(header):
+    response = backend.app.test_client().get('/livez', headers={'X-Request-ID': header})
+
+    request_id = response.headers['X-Request-ID']
+    assert request_id != header
+    assert backend.REQUEST_ID_PATTERN.fullmatch(request_id)
+
+
+def test_well_formed_request_id_is_reused():
+    response = backend.app.test_client().get('/livez', headers={'X-Request-ID': 'lb-1a2b.3_c'})
+
+    assert response.headers['X-Request-ID'] == 'lb-1a2b.3_c'
@@ -0,0 +1,79 @@
+import io
+import time
+
+import pytest
+
+import backend
+import fake_genai
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(backend, "GENAI_PROVIDER_MODULE", "fake_genai")
+    monkeypatch.setitem(backend.gemini_state, "model", None)
+    monkeypatch.setitem(backend.prompt_cache_state, "content", None)
+    monkeypatch.setitem(backend.prompt_cache_state, "disabled_until", 0.0)
+    fake_genai.reset()
+    yield backend.app.test_client()
+    fake_genai.reset()
+
+
+def analyze(client):
+    response = client.post('/analyze', data={'file': (io.BytesIO(b'audio'), 'meeting.mp3')})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_cached_context_is_created_once_and_requests_send_only_the_task(client):
+    first = analyze(client)
+    second = analyze(client)
+
+    assert fake_genai.calls["create"] == 1
+    assert fake_genai.calls["update"] == 0
+    for call in fake_genai.calls["generate"]:
+        assert call["cached_content"] is not None
+        assert call["text"] == [backend.analysis_prompt["task"]]
+
+    file_info = second["file_info"]
+    assert file_info["prompt_id"] == "analysis@v1"
+    assert file_info["prompt_version"] == "v1"
+    assert file_info["prompt_hash"] == backend.analysis_prompt["hash"]
+    assert file_info["prompt_mode"] == "cached_context"
+    assert file_info["usage"]["cached_tokens"] > 0
+    assert file_info["usage"]["output_tokens"] == 42
+    assert first["transcript"]["turn_count"] == 2
+
+
+def test_cached_context_is_refreshed_inside_the_margin(client):
+    analyze(client)
+    backend.prompt_cache_state["expires_at"] = time.time() + backend.PROMPT_CACHE_REFRESH_MARGIN - 1
+
+    analyze(client)
+
+    assert fake_genai.calls["create"] == 1
+    assert fake_genai.calls["update"] == 1
+    assert backend.prompt_cache_state["expires_at"] > time.time() + backend.PROMPT_CACHE_REFRESH_MARGIN
+
+
+def test_falls_back_to_system_instruction_without_caching(client):
+    fake_genai.reset(caching_supported=False)
+
+    result = analyze(client)
+
+    call = fake_genai.calls["generate"][0]
+    assert result["file_info"]["prompt_mode"] == "system_instruction"
+    assert call["system_instruction"] == backend.analysis_prompt["instructions"]
+    assert call["text"] == [backend.analysis_prompt["task"]]
+    assert result["file_info"]["usage"]["cached_tokens"] == 0
+
+
+def test_falls_back_to_inline_prompt_without_system_instructions(client):
+    fake_genai.reset(caching_supported=False, system_instruction_supported=False)
+
+    result = analyze(client)
+
+    call = fake_genai.calls["generate"][0]
+    assert result["file_info"]["prompt_mode"] == "inline"
+    assert call["system_instruction"] is None
+    assert call["text"] == [backend.analysis_prompt["inline"]]
@@ -0,0 +1,117 @@
+import copy
+import runpy
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import backend
+import fake_genai
+
+CHEAP_MODULE = "tabnanny"
+
+
+@pytest.fixture
+def startup(monkeypatch):
+    """Fresh warm-up state with a cheap module list and the fake provider"""
+    state = copy.deepcopy(backend.startup_state)
+    state.update(ready=False, import_timings={}, errors=[], duration_ms=None)
+    monkeypatch.setattr(backend, "startup_state", state)
+    monkeypatch.setattr(backend, "WARMUP_MODULES", [CHEAP_MODULE, "json"])
+    monkeypatch.setattr(backend, "GENAI_PROVIDER_MODULE", "fake_genai")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setitem(backend.gemini_state, "model", None)
+    monkeypatch.delitem(sys.modules, CHEAP_MODULE, raising=False)
+    fake_genai.reset()
+    return state
+
+
+def join_warm_up_threads():
+    for thread in threading.enumerate():
+        if thread.name == "verta-warm-up":
+            thread.join(timeout=5)
+
+
+def test_livez_answers_without_warm_up(startup):
+    response = backend.app.test_client().get('/livez')
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "alive"}
+
+
+def test_readyz_reports_warming_up_until_warm_up_finishes(startup):
+    client = backend.app.test_client()
+
+    assert client.get('/readyz').status_code == 503
+
+    backend.warm_up()
+    response = client.get('/readyz')
+
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ready"
+    assert set(response.get_json()["warmup"]["import_timings"]) == {CHEAP_MODULE, "json"}
+
+
+def test_readyz_serialises_a_snapshot(startup, monkeypatch):
+    captured = {}
+    monkeypatch.setattr(backend, "jsonify", lambda payload: captured.setdefault("payload", payload))
+
+    with backend.app.test_request_context('/readyz'):
+        backend.readyz()
+
+    warmup = captured["payload"]["warmup"]
+    assert warmup == backend.startup_state
+    assert warmup is not backend.startup_state
+    assert warmup["import_timings"] is not backend.startup_state["import_timings"]
+    assert warmup["errors"] is not backend.startup_state["errors"]
+
+
+def test_profile_import_records_new_and_cached_modules(startup):
+    fresh = backend.profile_import(CHEAP_MODULE)
+    cached = backend.profile_import(CHEAP_MODULE)
+
+    assert fresh["cached"] is False
+    assert fresh["new_modules"] >= 1
+    assert fresh["ms"] >= 0
+    assert cached == {"ms": 0.0, "new_modules": 0, "cached": True}
+    assert backend.startup_state["import_timings"][CHEAP_MODULE] == cached
+
+
+def test_warm_up_builds_sdk_clients(startup):
+    backend.warm_up()
+
+    assert fake_genai.calls["clients"] == backend.GEMINI_CLIENT_FACTORIES
+    assert backend.startup_state["model_name"] == backend.GEMINI_MODEL_NAMES[0]
+    assert backend.startup_state["errors"] == []
+
+
+def test_preforked_background_warm_up_finishes_in_the_worker(startup, monkeypatch):
+    monkeypatch.setattr(backend, "WARMUP_MODE", "background")
+    monkeypatch.setattr(backend, "WARMUP_PER_WORKER", True)
+
+    # Import-time phase in the gunicorn master: imports only, inline, no thread or clients
+    backend.start_warm_up()
+
+    assert not any(thread.name == "verta-warm-up" for thread in threading.enumerate())
+    assert CHEAP_MODULE in backend.startup_state["import_timings"]
+    assert backend.startup_state["ready"] is False
+    assert fake_genai.calls["clients"] == []
+
+    # post_fork phase in each worker
+    backend.start_worker_warm_up()
+    join_warm_up_threads()
+
+    assert backend.startup_state["ready"] is True
+    assert fake_genai.calls["clients"] == backend.GEMINI_CLIENT_FACTORIES
+
+
+def test_gunicorn_config_defers_clients_to_workers(monkeypatch):
+    monkeypatch.setenv("WARMUP_PER_WORKER", "false")
+    monkeypatch.setenv("WARMUP_MODE", "background")
+
+    config = runpy.run_path(str(Path(__file__).parent.parent / "gunicorn.conf.py"))
+
+    assert config["preload_app"] is True
+    assert callable(config["post_fork"])
+    assert backend.os.environ["WARMUP_PER_WORKER"] == "true"
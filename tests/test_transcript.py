@@ -0,0 +1,133 @@
+import io
+
+import pytest
+
+import backend
+import fake_genai
+
+
+def test_unlabelled_turns_share_time_until_next_label():
+    # Segment 2 of the analysis prompt's own example
+    segment = {
+        "time_range": "01:30–03:00",
+        "speaker": "Speaker B (continues), Speaker C (question at 02:30)",
+        "transcript": "Speaker B: 'The client just called with feedback on our proposal.'\n\n"
+                      "[02:30] Speaker C: 'What kind of timeline adjustments are they looking for?'\n\n"
+                      "Speaker B: 'They want to move the delivery date up by two weeks.'"
+    }
+
+    index = backend.build_transcript_index([segment])
+    turns = index["turns"]
+    stats = index["speaker_stats"]
+
+    assert [turn["t"] for turn in turns[:2]] == [90, 150]
+    assert turns[0]["d"] == 60
+    assert "est" not in turns[1]
+    assert turns[2].get("est") is True
+    assert turns[1]["d"] > 0 and turns[2]["d"] > 0
+    assert turns[1]["d"] + turns[2]["d"] == 30
+    assert stats["Speaker C"]["talk_time"] == turns[1]["d"]
+    assert stats["Speaker B"]["talk_time"] == 60 + turns[2]["d"]
+
+
+def test_turns_without_labels_split_segment_by_text_length():
+    segment = {
+        "time_range": "00:00–01:30",
+        "speaker": "Speaker A",
+        "transcript": "Speaker A: hi\n\nSpeaker B: " + "x" * 98
+    }
+
+    stats = backend.build_transcript_index([segment])["speaker_stats"]
+
+    assert stats["Speaker A"]["talk_time"] > 0
+    assert stats["Speaker A"]["talk_time"] + stats["Speaker B"]["talk_time"] == 90
+    assert stats["Speaker B"]["talk_time"] > stats["Speaker A"]["talk_time"]
+
+
+def test_turn_times_stay_unknown_without_segment_bounds():
+    segment = {"speaker": "Speaker A", "transcript": "Speaker A: hi\n\nSpeaker B: hello"}
+
+    index = backend.build_transcript_index([segment])
+
+    assert all(turn["t"] is None and turn["d"] is None for turn in index["turns"])
+    assert index["speaker_stats"]["Speaker A"] == {"talk_time": None, "turns": 1}
+
+
+def test_store_analysis_returns_all_segments_when_small():
+    result = backend.create_sample_analysis("meeting.mp4")
+
+    response = backend.store_analysis(result)
+
+    assert response["segment_count"] == len(result["segments"])
+    assert len(response["segments"]) == len(result["segments"])
+    assert all("transcript" not in segment for segment in response["segments"])
+
+
+def test_long_segments_send_capped_turns_and_page_the_rest(monkeypatch):
+    monkeypatch.setattr(backend, "SEGMENT_TURN_LIMIT", 3)
+    transcript = "\n\n".join(f"Speaker {'AB'[i % 2]}: line {i}" for i in range(8))
+    result = {"segments": [
+        {"time_range": "00:00–01:00", "transcript": "Speaker A: hello"},
+        {"time_range": "01:00–02:00", "transcript": transcript}
+    ]}
+
+    response = backend.store_analysis(result)
+    segment = response["segments"][1]
+
+    assert segment["turn_count"] == 8
+    assert len(segment["turns"]) == 3
+    assert response["transcript"]["turn_count"] == 9
+
+    loaded = len(segment["turns"])
+    rest = backend.app.test_client().get(
+        f"/analysis/{response['analysis_id']}/turns"
+        f"?offset={segment['turn_offset'] + loaded}&limit={segment['turn_count'] - loaded}"
+    ).get_json()
+
+    assert [turn["text"] for turn in rest["turns"]] == [f"line {i}" for i in range(3, 8)]
+    assert rest["has_more"] is False
+
+
+def test_turns_endpoint_rejects_invalid_time_range():
+    analysis_id = backend.store_analysis(backend.create_sample_analysis())["analysis_id"]
+    client = backend.app.test_client()
+
+    assert client.get(f"/analysis/{analysis_id}/turns?start=x").status_code == 400
+    assert client.get(f"/analysis/{analysis_id}/turns?end=1.5").status_code == 400
+
+    response = client.get(f"/analysis/{analysis_id}/turns?start=300&end=500")
+    assert response.status_code == 200
+    assert all(300 <= turn["t"] < 500 for turn in response.get_json()["turns"])
+
+
+@pytest.mark.parametrize("segment", [
+    {"time_range": "00:00–01:00", "speaker": ["Speaker A", "Speaker B"], "transcript": "Speaker A: hi\n\n[00:30] Speaker B: hello"},
+    {"time_range": "00:00–01:00", "speaker": "Speaker A", "transcript": ["Speaker A: hi", "[00:30] Speaker B: hello"]},
+    {"time_range": 90, "speaker": "Speaker A", "transcript": "Speaker A: hi\n\nSpeaker B: hello"},
+    {"time_range": None, "speaker": 7, "transcript": 42},
+    "Speaker A: a bare string instead of an object",
+])
+def test_store_analysis_tolerates_malformed_segments(segment):
+    response = backend.store_analysis({"segments": [segment]})
+
+    assert response["segment_count"] == 1
+    assert response["transcript"]["turn_count"] >= 1
+
+
+def test_malformed_model_output_is_not_replaced_by_sample_data(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(backend, "GENAI_PROVIDER_MODULE", "fake_genai")
+    monkeypatch.setitem(backend.gemini_state, "model", None)
+    monkeypatch.setattr(fake_genai, "RESPONSE", {
+        "segments": [
+            {"time_range": 90, "speaker": ["Speaker A", "Speaker B"], "transcript": ["Speaker A: hi", "Speaker B: hello"]}
+        ]
+    })
+    fake_genai.reset()
+
+    response = backend.app.test_client().post('/analyze', data={'file': (io.BytesIO(b'audio'), 'meeting.mp3')})
+    result = response.get_json()
+
+    assert result["file_info"]["analysis_type"] == "VERTA AI Analysis - Real Gemini Processing"
+    assert "note" not in result
+    assert result["transcript"]["speakers"] == ["Speaker A", "Speaker B"]
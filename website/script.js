@@ -79,7 +79,8 @@ async function wakeUpBackend() {
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), 45000); // 45 second timeout for cold starts
         
-        const response = await fetch(`${BACKEND_URL}/health`, {
+        // /readyz only succeeds once the backend has finished warming up its AI client
+        const response = await fetch(`${BACKEND_URL}/readyz`, {
             method: 'GET',
             mode: 'cors',
             signal: controller.signal,
@@ -94,6 +95,10 @@ async function wakeUpBackend() {
             console.log('✅ Backend is awake and ready!');
             updateBackendStatus('connected', 'Server ready');
             return true;
+        } else if (response.status === 503) {
+            console.log('⏳ Backend is up and warming up');
+            updateBackendStatus('warning', 'Server warming up...');
+            return false;
         } else {
             console.log('⚠️ Backend responded but may not be fully ready');
             updateBackendStatus('warning', 'Server starting...');
@@ -180,6 +185,8 @@ document.addEventListener('DOMContentLoaded', function() {
     const resultsSection = document.getElementById('demo-results');
     
     let selectedFile = null;
+    let currentAnalysis = null; // { id, speakers, loaded, total, loading, stopped, expired, turnObserver }
+    const TURN_PAGE_SIZE = 50; // Turns fetched per request for long segments
     
     // Upload zone click handler
     if (uploadZone && fileInput) {
@@ -360,6 +367,19 @@ document.addEventListener('DOMContentLoaded', function() {
         const meetingSummary = data.meeting_summary || {};
         const actionItems = data.action_items || [];
         const suggestions = data.improvement_suggestions || [];
+        const transcriptInfo = data.transcript || {};
+        
+        // Segments arrive pre-parsed and paginated; remaining pages are fetched on demand
+        currentAnalysis = {
+            id: data.analysis_id,
+            speakers: transcriptInfo.speakers || [],
+            speakerStats: transcriptInfo.speaker_stats || {},
+            loaded: segments.length,
+            total: data.segment_count ?? segments.length,
+            loading: false,
+            stopped: false,
+            expired: false
+        };
         
         const resultsHTML = `
             <div class="space-y-8">
@@ -386,6 +406,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Initialize accordion
         initializeAccordion();
+        initializeTranscriptPaging();
         
         // Scroll to results
         resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
@@ -460,102 +481,262 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    // Create chronological transcript with proper speaker separation
+    // Create chronological transcript from the pre-parsed segment turns
     function createChronologicalTranscript(segments) {
         if (!segments || segments.length === 0) {
             return '<div class="text-center py-8 text-gray-500">No transcript available</div>';
         }
         
-        let transcriptHTML = '';
+        const hasMore = currentAnalysis && currentAnalysis.loaded < currentAnalysis.total;
         
-        segments.forEach((segment, index) => {
-            const timeRange = segment.time_range || `Segment ${index + 1}`;
-            const speaker = segment.speaker || 'Unknown Speaker';
-            const sentiment = segment.sentiment || 'Neutral';
-            const topic = segment.topic || 'General Discussion';
-            const transcript = segment.transcript || 'No content available';
-            
-            // Parse and format the transcript content
-            const formattedContent = parseTranscriptContent(transcript, timeRange);
+        return `
+            <div id="transcript-segments">
+                ${segments.map(renderTranscriptSegment).join('')}
+            </div>
+            <div class="text-center mt-4 ${hasMore ? '' : 'hidden'}" id="load-more-segments-wrapper">
+                <button id="load-more-segments" class="bg-blue-100 text-blue-800 px-4 py-2 rounded-full text-sm font-medium">
+                    Load more segments
+                </button>
+            </div>
+        `;
+    }
+    
+    // Render a single segment header and its turns
+    function renderTranscriptSegment(segment, index) {
+        const segmentIndex = segment.index ?? index;
+        const timeRange = segment.time_range || `Segment ${segmentIndex + 1}`;
+        const turns = segment.turns || [];
+        const turnCount = segment.turn_count ?? turns.length;
+        const sentiment = segment.sentiment || 'Neutral';
+        const topic = segment.topic || 'General Discussion';
+        
+        return `
+            <div class="transcript-segment mb-6 last:mb-0">
+                <!-- Segment Header -->
+                <div class="segment-header flex items-center justify-between mb-3 pb-2 border-b border-gray-200">
+                    <div class="flex items-center space-x-3">
+                        <span class="time-badge bg-blue-100 text-blue-800 px-3 py-1 rounded-full text-sm font-medium">
+                            ${timeRange}
+                        </span>
+                        <span class="topic-badge bg-gray-100 text-gray-700 px-3 py-1 rounded-full text-sm">
+                            ${topic}
+                        </span>
+                    </div>
+                    <span class="sentiment-badge px-3 py-1 text-xs rounded-full ${getSentimentClass(sentiment)}">
+                        ${sentiment}
+                    </span>
+                </div>
+                
+                <!-- Transcript Content -->
+                <div class="transcript-content" id="segment-turns-${segmentIndex}">
+                    ${renderTurns(turns)}
+                </div>
+                
+                <!-- Remaining turns are fetched when this comes into view -->
+                ${turns.length < turnCount ? `
+                    <div class="segment-more-turns text-center mt-3"
+                         data-segment="${segmentIndex}"
+                         data-turn-offset="${segment.turn_offset}"
+                         data-turn-count="${turnCount}"
+                         data-loaded="${turns.length}">
+                        <button class="bg-gray-100 text-gray-700 px-4 py-2 rounded-full text-sm font-medium">
+                            Show more of this segment
+                        </button>
+                    </div>
+                ` : ''}
+            </div>
+        `;
+    }
+    
+    // Render turns ({t, speaker, text}) using the speaker table from the backend
+    function renderTurns(turns) {
+        if (!turns || turns.length === 0) {
+            return '<div class="text-gray-500 italic">No content available for this segment</div>';
+        }
+        
+        return turns.map(turn => {
+            const speaker = currentAnalysis?.speakers[turn.speaker] || 'Unknown Speaker';
+            // Estimated start times (turns without a [mm:ss] label) are not shown
+            const timestamp = turn.t !== null && turn.t !== undefined && !turn.est
+                ? `<span class="text-gray-400 text-xs font-mono ml-2">[${formatTurnTime(turn.t)}]</span>`
+                : '';
             
-            transcriptHTML += `
-                <div class="transcript-segment mb-6 last:mb-0">
-                    <!-- Segment Header -->
-                    <div class="segment-header flex items-center justify-between mb-3 pb-2 border-b border-gray-200">
-                        <div class="flex items-center space-x-3">
-                            <span class="time-badge bg-blue-100 text-blue-800 px-3 py-1 rounded-full text-sm font-medium">
-                                ${timeRange}
-                            </span>
-                            <span class="topic-badge bg-gray-100 text-gray-700 px-3 py-1 rounded-full text-sm">
-                                ${topic}
-                            </span>
+            return `
+                <div class="speaker-block mb-4 last:mb-0">
+                    <div class="speaker-info flex items-center mb-2">
+                        <div class="speaker-avatar w-8 h-8 rounded-full bg-gradient-to-r ${getSpeakerColor(speaker)} flex items-center justify-center text-white text-sm font-bold mr-3">
+                            ${speaker.slice(-1)}
                         </div>
-                        <span class="sentiment-badge px-3 py-1 text-xs rounded-full ${getSentimentClass(sentiment)}">
-                            ${sentiment}
-                        </span>
+                        <span class="speaker-name font-semibold text-gray-800">${speaker}</span>
+                        ${timestamp}
                     </div>
-                    
-                    <!-- Transcript Content -->
-                    <div class="transcript-content">
-                        ${formattedContent}
+                    <div class="speaker-content bg-white rounded-lg p-4 ml-11 shadow-sm border border-gray-100">
+                        <p class="text-gray-700 leading-relaxed">"${turn.text}"</p>
                     </div>
                 </div>
             `;
-        });
-        
-        return transcriptHTML;
+        }).join('');
     }
     
-    // Parse transcript content and separate speakers chronologically
-    function parseTranscriptContent(transcript, timeRange) {
-        if (!transcript || transcript === 'No transcript available') {
-            return '<div class="text-gray-500 italic">No content available for this segment</div>';
+    // Format seconds as mm:ss
+    function formatTurnTime(seconds) {
+        const minutes = Math.floor(seconds / 60);
+        const secs = seconds % 60;
+        return `${String(minutes).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+    }
+    
+    // Fetch and render segments and turns as the transcript is scrolled
+    function initializeTranscriptPaging() {
+        const container = document.querySelector('.transcript-container');
+        const loadMoreBtn = document.getElementById('load-more-segments');
+        
+        if (loadMoreBtn) {
+            loadMoreBtn.addEventListener('click', loadMoreSegments);
         }
         
-        // Split by speaker changes and format chronologically
-        const speakerBlocks = transcript.split(/(?=Speaker [A-Z]:)/);
-        let contentHTML = '';
-        
-        speakerBlocks.forEach((block, index) => {
-            if (block.trim()) {
-                // Extract speaker and content
-                const speakerMatch = block.match(/(Speaker [A-Z]):\s*"?([^"]*)"?/);
-                if (speakerMatch) {
-                    const [, speaker, content] = speakerMatch;
-                    const cleanContent = content.replace(/\\n\\n/g, ' ').replace(/\\n/g, ' ').trim();
-                    
-                    if (cleanContent) {
-                        contentHTML += `
-                            <div class="speaker-block mb-4 last:mb-0">
-                                <div class="speaker-info flex items-center mb-2">
-                                    <div class="speaker-avatar w-8 h-8 rounded-full bg-gradient-to-r ${getSpeakerColor(speaker)} flex items-center justify-center text-white text-sm font-bold mr-3">
-                                        ${speaker.slice(-1)}
-                                    </div>
-                                    <span class="speaker-name font-semibold text-gray-800">${speaker}</span>
-                                </div>
-                                <div class="speaker-content bg-white rounded-lg p-4 ml-11 shadow-sm border border-gray-100">
-                                    <p class="text-gray-700 leading-relaxed">"${cleanContent}"</p>
-                                </div>
-                            </div>
-                        `;
-                    }
-                } else {
-                    // Handle content without clear speaker format
-                    const cleanBlock = block.replace(/\\n\\n/g, ' ').replace(/\\n/g, ' ').trim();
-                    if (cleanBlock) {
-                        contentHTML += `
-                            <div class="speaker-block mb-4 last:mb-0">
-                                <div class="speaker-content bg-gray-50 rounded-lg p-4 shadow-sm border border-gray-100">
-                                    <p class="text-gray-700 leading-relaxed">${cleanBlock}</p>
-                                </div>
-                            </div>
-                        `;
-                    }
-                }
+        if (container) {
+            container.addEventListener('click', function(e) {
+                const loader = e.target.closest('.segment-more-turns');
+                if (loader) loadSegmentTurns(loader);
+            });
+            
+            if ('IntersectionObserver' in window) {
+                currentAnalysis.turnObserver = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (entry.isIntersecting && !currentAnalysis.stopped) {
+                            loadSegmentTurns(entry.target);
+                        }
+                    });
+                }, { root: container, rootMargin: '200px' });
+                observeTurnLoaders();
             }
+            
+            container.addEventListener('scroll', function() {
+                // Automatic loading stops after a failure; the button can still retry
+                if (currentAnalysis?.stopped) return;
+                if (container.scrollTop + container.clientHeight >= container.scrollHeight - 200) {
+                    loadMoreSegments();
+                }
+            });
+        }
+    }
+    
+    // Watch "show more" markers that are not observed yet
+    function observeTurnLoaders() {
+        if (!currentAnalysis?.turnObserver) return;
+        
+        document.querySelectorAll('.segment-more-turns:not([data-observed])').forEach(loader => {
+            loader.dataset.observed = 'true';
+            currentAnalysis.turnObserver.observe(loader);
         });
+    }
+    
+    // Results live in server memory and are gone after a restart or eviction
+    function markAnalysisExpired() {
+        currentAnalysis.expired = true;
+        currentAnalysis.stopped = true;
+        document.getElementById('load-more-segments-wrapper')?.classList.add('hidden');
+        document.querySelectorAll('.segment-more-turns').forEach(loader => loader.remove());
+        showNotification('This analysis has expired. Analyze the file again to see the full transcript.', 'error');
+    }
+    
+    // Let the open accordion panel grow to fit newly rendered content
+    function growTranscriptPanel() {
+        const content = document.querySelector('[data-accordion-content="transcript"]');
+        if (content && content.style.maxHeight && content.style.maxHeight !== '0px') {
+            content.style.maxHeight = content.scrollHeight + 'px';
+        }
+    }
+    
+    // Fetch the next page of turns for one long segment
+    async function loadSegmentTurns(loader) {
+        if (!currentAnalysis || !currentAnalysis.id || currentAnalysis.expired || loader.dataset.loading) return;
+        
+        const turnOffset = Number(loader.dataset.turnOffset);
+        const turnCount = Number(loader.dataset.turnCount);
+        const loaded = Number(loader.dataset.loaded);
+        if (loaded >= turnCount) return;
+        
+        loader.dataset.loading = 'true';
         
-        return contentHTML || '<div class="text-gray-500 italic">No readable content in this segment</div>';
+        try {
+            const limit = Math.min(TURN_PAGE_SIZE, turnCount - loaded);
+            const url = `${BACKEND_URL}/analysis/${currentAnalysis.id}/turns?offset=${turnOffset + loaded}&limit=${limit}`;
+            const response = await fetch(url, { method: 'GET', mode: 'cors' });
+            
+            if (response.status === 404) {
+                markAnalysisExpired();
+                return;
+            }
+            
+            if (!response.ok) {
+                throw new Error(`Failed to load turns: ${response.status}`);
+            }
+            
+            const page = await response.json();
+            document.getElementById(`segment-turns-${loader.dataset.segment}`)
+                ?.insertAdjacentHTML('beforeend', renderTurns(page.turns));
+            
+            const nowLoaded = loaded + page.turns.length;
+            loader.dataset.loaded = nowLoaded;
+            
+            if (nowLoaded >= turnCount || page.turns.length === 0) {
+                currentAnalysis.turnObserver?.unobserve(loader);
+                loader.remove();
+            }
+            
+            growTranscriptPanel();
+        } catch (error) {
+            console.error('❌ Turn loading error:', error);
+            currentAnalysis.stopped = true;
+            showNotification('Could not load more of this segment', 'error');
+        } finally {
+            delete loader.dataset.loading;
+        }
+    }
+    
+    async function loadMoreSegments() {
+        if (!currentAnalysis || !currentAnalysis.id || currentAnalysis.loading || currentAnalysis.expired) return;
+        if (currentAnalysis.loaded >= currentAnalysis.total) return;
+        
+        currentAnalysis.loading = true;
+        
+        try {
+            const url = `${BACKEND_URL}/analysis/${currentAnalysis.id}/segments?offset=${currentAnalysis.loaded}`;
+            const response = await fetch(url, { method: 'GET', mode: 'cors' });
+            
+            if (response.status === 404) {
+                markAnalysisExpired();
+                return;
+            }
+            
+            if (!response.ok) {
+                throw new Error(`Failed to load segments: ${response.status}`);
+            }
+            
+            const page = await response.json();
+            const list = document.getElementById('transcript-segments');
+            
+            if (list) {
+                list.insertAdjacentHTML('beforeend', page.segments.map(renderTranscriptSegment).join(''));
+                observeTurnLoaders();
+            }
+            
+            currentAnalysis.loaded += page.segments.length;
+            
+            if (!page.has_more || page.segments.length === 0) {
+                currentAnalysis.loaded = currentAnalysis.total;
+                document.getElementById('load-more-segments-wrapper')?.classList.add('hidden');
+            }
+            
+            growTranscriptPanel();
+        } catch (error) {
+            console.error('❌ Segment loading error:', error);
+            currentAnalysis.stopped = true;
+            showNotification('Could not load more transcript segments', 'error');
+        } finally {
+            currentAnalysis.loading = false;
+        }
     }
     
     // Get speaker-specific color
@@ -571,23 +752,6 @@ document.addEventListener('DOMContentLoaded', function() {
         return colors[speaker] || 'from-gray-500 to-gray-600';
     }
     
-    // Get unique speakers from segments
-    function getUniqueSpeekers(segments) {
-        const speakers = new Set();
-        segments.forEach(segment => {
-            if (segment.speaker) {
-                // Extract individual speakers from combined speaker strings
-                const speakerMatches = segment.speaker.match(/Speaker [A-Z]/g);
-                if (speakerMatches) {
-                    speakerMatches.forEach(speaker => speakers.add(speaker));
-                } else {
-                    speakers.add(segment.speaker);
-                }
-            }
-        });
-        return Array.from(speakers);
-    }
-    
     // Create Analysis Accordion
     function createAnalysisAccordion(segments, engagementScore, meetingSummary, actionItems, suggestions) {
         const accordionItems = [
@@ -601,7 +765,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         ${createChronologicalTranscript(segments)}
                     </div>
                 `,
-                badge: `${segments.length} segments`
+                badge: `${currentAnalysis.total} segments`
             },
             {
                 id: 'engagement',
@@ -633,11 +797,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 content: `
                     <div class="stats-grid grid grid-cols-2 md:grid-cols-4 gap-4">
                         <div class="stat-card bg-blue-50 rounded-lg p-4 text-center">
-                            <div class="text-2xl font-bold text-blue-600">${segments.length}</div>
+                            <div class="text-2xl font-bold text-blue-600">${currentAnalysis.total}</div>
                             <div class="text-sm text-gray-600">Segments</div>
                         </div>
                         <div class="stat-card bg-green-50 rounded-lg p-4 text-center">
-                            <div class="text-2xl font-bold text-green-600">${getUniqueSpeekers(segments).length}</div>
+                            <div class="text-2xl font-bold text-green-600">${currentAnalysis.speakers.length}</div>
                             <div class="text-sm text-gray-600">Speakers</div>
                         </div>
                         <div class="stat-card bg-purple-50 rounded-lg p-4 text-center">
@@ -649,8 +813,22 @@ document.addEventListener('DOMContentLoaded', function() {
                             <div class="text-sm text-gray-600">Decisions</div>
                         </div>
                     </div>
+                    ${currentAnalysis.speakers.length > 0 ? `
+                        <div class="speaker-stats mt-6 space-y-2">
+                            ${currentAnalysis.speakers.map(speaker => {
+                                const stats = currentAnalysis.speakerStats[speaker] || { talk_time: null, turns: 0 };
+                                const talkTime = stats.talk_time === null ? '—' : formatTurnTime(stats.talk_time);
+                                return `
+                                    <div class="flex items-center justify-between text-sm text-gray-700">
+                                        <span class="font-medium">${speaker}</span>
+                                        <span>${talkTime} talk time · ${stats.turns} turns</span>
+                                    </div>
+                                `;
+                            }).join('')}
+                        </div>
+                    ` : ''}
                 `,
-                badge: `${getUniqueSpeekers(segments).length} speakers`
+                badge: `${currentAnalysis.speakers.length} speakers`
             },
             {
                 id: 'summary',
@@ -821,41 +999,6 @@ document.addEventListener('DOMContentLoaded', function() {
         `;
     }
     
-    function formatVertaTranscript(transcript) {
-        if (!transcript || transcript === 'No transcript available') {
-            return '<em class="text-gray-500">No transcript available</em>';
-        }
-        
-        // Apply VERTA professional formatting
-        return transcript
-            .split('\\n\\n') // Split by speaker blocks
-            .map(block => {
-                if (block.trim()) {
-                    // Check if block starts with timestamp
-                    const timestampMatch = block.match(/^\[(\d{2}:\d{2})\]\s*(.+)/);
-                    if (timestampMatch) {
-                        const [, timestamp, content] = timestampMatch;
-                        return `<div class="mb-3">
-                            <span class="text-gray-400 text-xs font-mono">[${timestamp}]</span>
-                            <div class="mt-1">${formatSpeakerContent(content)}</div>
-                        </div>`;
-                    } else {
-                        return `<div class="mb-3">${formatSpeakerContent(block)}</div>`;
-                    }
-                }
-                return '';
-            })
-            .join('');
-    }
-    
-    function formatSpeakerContent(content) {
-        // Format speaker names in bold and content in quotes
-        return content.replace(
-            /(Speaker [A-Z]):\s*"([^"]+)"/g,
-            '<strong class="text-gray-800">$1:</strong> <span class="text-gray-700">"$2"</span>'
-        );
-    }
-
     function showNotification(message, type) {
         console.log(`${type.toUpperCase()}: ${message}`);
         